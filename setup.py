@@ -30,22 +30,20 @@ setup(
         'Programming Language :: Python :: 3.10',
         'Programming Language :: Python :: 3.11',
         'Programming Language :: Python :: 3.12',
+        'Programming Language :: Python :: 3.13',
         'Topic :: Scientific/Engineering :: Artificial Intelligence',
         'Topic :: Utilities',
     ],
     py_modules=['splitmerge'],
-    install_requires=[
-        'safetensors>=0.4.0',
-        'torch>=2.0.0',
-        'packaging>=21.0',
-        'numpy>=1.20.0',
-    ],
+    # The merge copies raw byte ranges between files, so only the Python
+    # standard library is needed - no safetensors/torch import at runtime
+    install_requires=[],
     entry_points={
         'console_scripts': [
             'splitmerge=splitmerge:main',
         ],
     },
-    python_requires='>=3.8,<3.13',  # PyTorch compatibility - avoid Python 3.13
+    python_requires='>=3.8',
     project_urls={
         'Bug Reports': 'https://github.com/yourusername/splitmerge/issues',
         'Source': 'https://github.com/yourusername/splitmerge',
@@ -31,16 +31,21 @@ Credits: Merge logic adapted from reshard-safetensors by NotTheStallion
 """
 
 import sys
+import os
+import hashlib
+import json
+import struct
 import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 import re
 
-# Direct safetensors imports - no other dependencies needed
-from safetensors import safe_open
-from safetensors.torch import save_file
+# Shard filename pattern: model-00001-of-00004.safetensors
+_SHARD_RE = re.compile(r'model-(\d{1,6})-of-(\d{1,6})\.safetensors')
 
 
-def is_lfs_pointer(file_path: Path) -> bool:
+def is_lfs_pointer(file_path: Path, file_size: int) -> bool:
     """
     Check if a file is a Git LFS pointer instead of actual data.
 
@@ -53,58 +58,522 @@ def is_lfs_pointer(file_path: Path) -> bool:
         oid sha256:abc123...
         size 12345678
 
+    A real safetensors file starts with an 8-byte little-endian header
+    length that must fit inside the file. An LFS pointer's first 8 bytes
+    are the ASCII text "version ", which decodes to an impossibly large
+    value - so a single 8-byte read distinguishes the two. Small files
+    that fail this sanity check (truncated or garbage) are also reported
+    as pointers so validation stops before the merge.
+
     Args:
         file_path: Path to the file to check
+        file_size: Size of the file in bytes (already known from the
+            directory scan, so no extra stat() is needed here)
 
     Returns:
-        bool: True if file is an LFS pointer, False if actual data
+        bool: True if file is an LFS pointer (or not valid safetensors),
+            False if actual data
     """
     # LFS pointers are always very small (< 200 bytes)
-    if file_path.stat().st_size > 200:
+    if file_size > 200:
         return False
 
+    with open(file_path, 'rb') as f:
+        head = f.read(8)
+    header_len = int.from_bytes(head, 'little')
+    return not (0 < header_len <= file_size - 8)
+
+
+def _read_shard_header(file_path):
+    """
+    Read the JSON header of a safetensors file without loading any tensors.
+
+    A safetensors file starts with an 8-byte little-endian header length,
+    followed by a JSON header describing each tensor's dtype, shape, and
+    byte range, followed by the flat binary tensor data.
+
+    Args:
+        file_path: Path to the safetensors file
+
+    Returns:
+        tuple: (header, data_start) where:
+            - header: Dict parsed from the JSON header (may include '__metadata__')
+            - data_start: Byte offset where tensor data begins in the file
+    """
+    with open(file_path, 'rb') as f:
+        header_len = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_len))
+    return header, 8 + header_len
+
+
+def plan_merge(shard_files):
+    """
+    Compute the merged output header and per-tensor copy plan.
+
+    Reads only the JSON header of each shard (no tensor data) and assigns
+    each tensor a sequential byte range in the output file. Metadata from
+    the first shard is preserved.
+
+    Args:
+        shard_files: List of paths (str or os.PathLike) to safetensors
+            shard files, in order
+
+    Returns:
+        tuple: (header_bytes, copy_plan, total_size) where:
+            - header_bytes: Complete serialized output header (length prefix
+              + padded JSON), ready to write at offset 0
+            - copy_plan: List of (name, shard_path, src_offset, dst_offset,
+              length) tuples; offsets are absolute file positions
+            - total_size: Final size of the output file in bytes
+
+    Raises:
+        ValueError: If the same tensor name appears in more than one shard
+            (e.g. a corrupted download, or a leftover single-file copy of
+            the model sitting alongside the shards)
+    """
+    metadata = None
+    header_entries = []
+    copy_plan = []
+    body_offset = 0
+    seen = {}
+
+    for file_path in shard_files:
+        header, data_start = _read_shard_header(file_path)
+        shard_metadata = header.pop('__metadata__', None)
+
+        # Keep metadata from the first shard only
+        if metadata is None:
+            metadata = shard_metadata
+
+        for name, info in header.items():
+            # The old dict-based merge silently let a later shard's copy of
+            # a repeated name win; fail loudly instead of merging wrong weights
+            if name in seen:
+                raise ValueError(
+                    f"Duplicate tensor '{name}' in "
+                    f"{os.path.basename(file_path)} and {seen[name]}"
+                )
+            seen[name] = os.path.basename(file_path)
+
+            begin, end = info['data_offsets']
+            length = end - begin
+            header_entries.append((name, {
+                'dtype': info['dtype'],
+                'shape': info['shape'],
+                'data_offsets': [body_offset, body_offset + length],
+            }))
+            copy_plan.append((name, file_path, data_start + begin, body_offset, length))
+            body_offset += length
+
+    # Build the header dict in one shot so the hash table is sized once
+    # instead of rehashing as it grows (large MoE models have 100k+ keys)
+    if metadata is not None:
+        header_entries.insert(0, ('__metadata__', metadata))
+    output_header = dict(header_entries)
+
+    header_json = json.dumps(output_header, separators=(',', ':')).encode('utf-8')
+    # Pad with spaces so tensor data starts on an 8-byte boundary
+    # (matches the official safetensors serializer)
+    padding = (8 - (8 + len(header_json)) % 8) % 8
+    header_json += b' ' * padding
+    header_bytes = struct.pack('<Q', len(header_json)) + header_json
+
+    # Shift copy destinations past the header
+    data_start = len(header_bytes)
+    copy_plan = [
+        (name, shard_path, src_off, data_start + dst_off, length)
+        for name, shard_path, src_off, dst_off, length in copy_plan
+    ]
+
+    return header_bytes, copy_plan, data_start + body_offset
+
+
+# Kernel copy offload support (Linux; sendfile supports file-to-file since 2.6.33)
+_HAS_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+_HAS_SENDFILE = hasattr(os, 'sendfile')
+
+# Fallback read/write chunk size - large enough to amortize syscall cost
+_COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+# sendfile writes at the destination fd's implicit file position, so the
+# seek + copy pair must not interleave across threads
+_SENDFILE_LOCK = threading.Lock()
+
+# Per-thread reusable copy buffer so parallel fallback copies neither
+# contend on a shared buffer nor allocate 4 MiB per chunk
+_COPY_BUFFERS = threading.local()
+
+
+def _copy_buffer():
+    """Return this thread's reusable copy buffer, creating it on first use."""
+    buf = getattr(_COPY_BUFFERS, 'buf', None)
+    if buf is None:
+        buf = memoryview(bytearray(_COPY_CHUNK_SIZE))
+        _COPY_BUFFERS.buf = buf
+    return buf
+
+
+def _copy_range(src_fd, dst_fd, src_off, dst_off, length):
+    """
+    Copy a byte range from one file descriptor to another.
+
+    Prefers os.copy_file_range (copies inside the kernel; on XFS/Btrfs this
+    can become a reflink, making the copy nearly free), then os.sendfile,
+    then a plain pread/pwrite loop with a 4 MiB buffer. The kernel paths
+    avoid moving tensor bytes through user space entirely.
+
+    Args:
+        src_fd: Source file descriptor (opened read-only)
+        dst_fd: Destination file descriptor (opened for writing)
+        src_off: Byte offset to read from in the source
+        dst_off: Byte offset to write to in the destination
+        length: Number of bytes to copy
+    """
+    copied = 0
+
+    if _HAS_COPY_FILE_RANGE:
+        try:
+            while copied < length:
+                n = os.copy_file_range(
+                    src_fd, dst_fd, length - copied,
+                    offset_src=src_off + copied,
+                    offset_dst=dst_off + copied,
+                )
+                if n == 0:
+                    break
+                copied += n
+            if copied == length:
+                return
+        except OSError:
+            # EXDEV/ENOSYS/EOPNOTSUPP: cross-filesystem copy or old kernel;
+            # continue from wherever the kernel path stopped
+            pass
+
+    if _HAS_SENDFILE:
+        try:
+            with _SENDFILE_LOCK:
+                os.lseek(dst_fd, dst_off + copied, os.SEEK_SET)
+                while copied < length:
+                    n = os.sendfile(dst_fd, src_fd, src_off + copied, length - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            if copied == length:
+                return
+        except OSError:
+            pass
+
+    buf = _copy_buffer()
+    while copied < length:
+        want = min(length - copied, _COPY_CHUNK_SIZE)
+        if hasattr(os, 'preadv'):
+            n = os.preadv(src_fd, [buf[:want]], src_off + copied)
+            chunk = buf[:n]
+        else:
+            chunk = os.pread(src_fd, want, src_off + copied)
+            n = len(chunk)
+        if n == 0:
+            raise IOError(f"Unexpected end of file at offset {src_off + copied}")
+        written = 0
+        while written < n:
+            written += os.pwrite(dst_fd, chunk[written:n], dst_off + copied + written)
+        copied += n
+
+
+def _copy_range_hashed(src_fd, dst_fd, src_off, dst_off, length):
+    """
+    Copy a byte range like _copy_range while hashing the source bytes.
+
+    Used by verify mode: bytes must pass through user space to be hashed,
+    so this always takes the buffered path instead of the kernel copy
+    offloads. hashlib's SHA-256 uses SHA-NI / ARMv8 crypto extensions via
+    OpenSSL, so hashing overlaps well with I/O stalls.
+
+    Args:
+        src_fd: Source file descriptor (opened read-only)
+        dst_fd: Destination file descriptor (opened for writing)
+        src_off: Byte offset to read from in the source
+        dst_off: Byte offset to write to in the destination
+        length: Number of bytes to copy
+
+    Returns:
+        str: Hex SHA-256 digest of the copied source bytes
+    """
+    hasher = hashlib.sha256()
+    buf = _copy_buffer()
+    copied = 0
+    while copied < length:
+        want = min(length - copied, _COPY_CHUNK_SIZE)
+        if hasattr(os, 'preadv'):
+            n = os.preadv(src_fd, [buf[:want]], src_off + copied)
+            chunk = buf[:n]
+        else:
+            chunk = os.pread(src_fd, want, src_off + copied)
+            n = len(chunk)
+        if n == 0:
+            raise IOError(f"Unexpected end of file at offset {src_off + copied}")
+        hasher.update(chunk)
+        written = 0
+        while written < n:
+            written += os.pwrite(dst_fd, chunk[written:n], dst_off + copied + written)
+        copied += n
+    return hasher.hexdigest()
+
+
+def _hash_range(fd, offset, length):
+    """
+    SHA-256 a byte range of an open file descriptor.
+
+    Args:
+        fd: File descriptor to read from
+        offset: Byte offset where the range starts
+        length: Number of bytes to hash
+
+    Returns:
+        str: Hex SHA-256 digest of the range
+    """
+    hasher = hashlib.sha256()
+    buf = _copy_buffer()
+    hashed = 0
+    while hashed < length:
+        want = min(length - hashed, _COPY_CHUNK_SIZE)
+        if hasattr(os, 'preadv'):
+            n = os.preadv(fd, [buf[:want]], offset + hashed)
+            chunk = buf[:n]
+        else:
+            chunk = os.pread(fd, want, offset + hashed)
+            n = len(chunk)
+        if n == 0:
+            raise IOError(f"Unexpected end of file at offset {offset + hashed}")
+        hasher.update(chunk)
+        hashed += n
+    return hasher.hexdigest()
+
+
+def _copy_shard_worker(shard_path, ranges, output_file, verify):
+    """
+    Copy one shard's tensors into the output file. Runs in a worker process.
+
+    Each worker owns a whole shard and its own file descriptors, so on
+    FUSE or NFS mounts every file is read by exactly one process and the
+    per-process caches/readahead work in its favor. Writes land at
+    pre-assigned offsets, so workers never contend on file position.
+
+    Args:
+        shard_path: Path to the shard file this worker is responsible for
+        ranges: List of (name, src_off, dst_off, length) tuples to copy
+        output_file: Path to the (already created) output file
+        verify: If True, hash source bytes while copying
+
+    Returns:
+        dict: Mapping of tensor name to hex SHA-256 source digest
+            (values are None when verify is False)
+    """
+    copy_func = _copy_range_hashed if verify else _copy_range
+    digests = {}
+
+    src_fd = os.open(shard_path, os.O_RDONLY)
+    dst_fd = os.open(output_file, os.O_WRONLY)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            first_line = f.readline()
-            return 'git-lfs.github.com' in first_line
-    except (UnicodeDecodeError, IOError):
-        # If we can't read it as text, it's not an LFS pointer
-        return False
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for name, src_off, dst_off, length in ranges:
+            digests[name] = copy_func(src_fd, dst_fd, src_off, dst_off, length)
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(src_fd)
+        os.close(dst_fd)
 
+    return digests
 
-def merge_safetensor_files(shard_files, output_file):
+
+def merge_safetensor_files(shard_files, output_file, verify=False,
+                           use_processes=False):
     """
     Merge multiple safetensors files into a single file.
 
-    Reads all tensors from each shard file and combines them into a single
-    safetensors file. Metadata from the first shard is preserved in the output.
-
-    This implementation is adapted from the reshard-safetensors project by
-    NotTheStallion: https://github.com/NotTheStallion/reshard-safetensors
+    Streams tensor bytes directly from each shard into the output file
+    rather than loading the full model into memory. Pass 1 reads only the
+    JSON header of each shard and lays out the combined output header;
+    pass 2 copies each tensor's byte range to its pre-assigned offset in
+    the output using kernel-side copies (copy_file_range/sendfile) where
+    available. Copies run concurrently on a thread pool - the kernel copy
+    calls release the GIL, so overlapping them keeps the request queue deep
+    enough to saturate NVMe or network storage. No torch (or numpy) tensor
+    objects are ever constructed: tensor bytes are treated as opaque ranges,
+    so peak memory stays bounded by the copy buffer, not the model size.
+    Metadata from the first shard is preserved in the output.
+
+    With verify=True, each tensor's source bytes are hashed with SHA-256
+    while they are copied, then the written output ranges are re-read
+    (after the page cache is dropped, so the bytes come back from disk)
+    and re-hashed; any digest mismatch raises. This catches silent
+    corruption that the byte-count check cannot, at the cost of routing
+    copies through user space instead of the kernel offloads.
+
+    With use_processes=True, the copy fans out one worker process per
+    shard instead of one thread per tensor. On FUSE or NFS mounts this
+    matters: per-process caches and readahead mean each file should be
+    read by exactly one process, and aggregate bandwidth scales with
+    min(shards, mount parallelism) rather than what a single process can
+    pull. On local NVMe the thread pool is usually the better default.
 
     Args:
-        shard_files: List of paths to safetensors shard files to merge
+        shard_files: List of paths (str or os.PathLike) to safetensors
+            shard files to merge
         output_file: Path where the merged file will be saved
+        verify: If True, SHA-256 every tensor range on both sides of the copy
+        use_processes: If True, copy with one process per shard instead of
+            a thread per tensor (better on FUSE/NFS-backed storage)
 
     Raises:
-        Exception: If files cannot be read or merged (propagated from safetensors)
+        Exception: If files cannot be read or merged (e.g. truncated shards),
+            or if verification detects a digest mismatch
     """
-    tensors = {}
-    metadata = None
+    header_bytes, copy_plan, total_size = plan_merge(shard_files)
+
+    # Verification re-reads the output, so it needs a readable fd
+    src_fds = {}
+    out_flags = (os.O_RDWR if verify else os.O_WRONLY) | os.O_CREAT | os.O_TRUNC
+    out_fd = os.open(output_file, out_flags, 0o644)
+    try:
+        if hasattr(os, 'posix_fallocate'):
+            # The final size is known exactly from the header plan, so
+            # reserve it up front: the output stays contiguous on disk,
+            # extent allocation happens once instead of per write, and a
+            # full disk fails here rather than mid-merge
+            try:
+                os.posix_fallocate(out_fd, 0, total_size)
+            except OSError:
+                pass  # filesystem doesn't support preallocation
+        os.pwrite(out_fd, header_bytes, 0)
+
+        max_workers = min(32, len(shard_files) * 4)
+
+        if use_processes:
+            # One whole shard per worker process; each worker opens its
+            # own descriptors and writes to pre-assigned offsets
+            ranges_by_shard = {}
+            for name, shard_path, src_off, dst_off, length in copy_plan:
+                ranges_by_shard.setdefault(shard_path, []).append(
+                    (name, src_off, dst_off, length))
+
+            src_digests = {}
+            workers = min(os.cpu_count() or 1, len(shard_files))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(_copy_shard_worker, shard_path, ranges,
+                                output_file, verify): shard_path
+                    for shard_path, ranges in ranges_by_shard.items()
+                }
+                total = len(futures)
+                for done, future in enumerate(as_completed(futures), start=1):
+                    src_digests.update(future.result())
+                    print(f"   Copied shard {done}/{total}")
+        else:
+            # Open each shard once; pread-style offsets make the fds safe
+            # to share across copy threads
+            for shard_path in shard_files:
+                fd = os.open(shard_path, os.O_RDONLY)
+                src_fds[shard_path] = fd
+                if hasattr(os, 'posix_fadvise'):
+                    # Prime kernel readahead for the sequential body copy
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            # Track how many copies remain per shard so its page cache can be
+            # released the moment its last tensor is done
+            pending_per_shard = {}
+            for name, shard_path, src_off, dst_off, length in copy_plan:
+                pending_per_shard[shard_path] = pending_per_shard.get(shard_path, 0) + 1
+
+            copy_func = _copy_range_hashed if verify else _copy_range
+            src_digests = {}
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(copy_func, src_fds[shard_path], out_fd,
+                                src_off, dst_off, length): (name, shard_path)
+                    for name, shard_path, src_off, dst_off, length in copy_plan
+                }
+                total = len(futures)
+                report_every = max(1, total // 10)
+                for done, future in enumerate(as_completed(futures), start=1):
+                    name, shard_path = futures[future]
+                    src_digests[name] = future.result()
+                    pending_per_shard[shard_path] -= 1
+                    if pending_per_shard[shard_path] == 0 and hasattr(os, 'posix_fadvise'):
+                        # Every byte of this shard has been read exactly once
+                        # and will never be needed again - release its page
+                        # cache so the merge doesn't evict other processes'
+                        # hot pages
+                        os.posix_fadvise(src_fds[shard_path], 0, 0, os.POSIX_FADV_DONTNEED)
+                    if done % report_every == 0 or done == total:
+                        print(f"   Copied {done}/{total} tensors")
+
+        if hasattr(os, 'posix_fadvise'):
+            # Flush first: DONTNEED only drops clean pages, so the output's
+            # dirty pages must hit disk before they can be released
+            os.fsync(out_fd)
+            os.posix_fadvise(out_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+        if verify:
+            print(f"🔍 Verifying {len(copy_plan)} tensors (SHA-256)...")
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                checks = {
+                    pool.submit(_hash_range, out_fd, dst_off, length): name
+                    for name, shard_path, src_off, dst_off, length in copy_plan
+                }
+                for future in as_completed(checks):
+                    name = checks[future]
+                    if future.result() != src_digests[name]:
+                        raise IOError(
+                            f"Verification failed: tensor '{name}' digest "
+                            f"mismatch between source and merged output"
+                        )
+            print(f"✓ All tensor digests match")
+    finally:
+        for fd in src_fds.values():
+            os.close(fd)
+        os.close(out_fd)
+
+
+def write_shard_index(shard_files, index_path):
+    """
+    Write a HuggingFace-style shard index instead of merging bytes.
 
-    for file in shard_files:
-        with safe_open(file, framework="pt") as sf_tsr:
-            # Get metadata from first file
-            if metadata is None:
-                metadata = sf_tsr.metadata()
+    Produces a model.safetensors.index.json mapping every tensor name to
+    the shard file that contains it, in the same format HuggingFace uses
+    to describe sharded checkpoints. Consumers that support the shard
+    index format (transformers, diffusers) can load the model directly
+    from the shards - no tensor bytes are ever copied.
 
-            # Load all tensors from this shard
-            for layer in sf_tsr.keys():
-                tensor = sf_tsr.get_tensor(str(layer))
-                tensors[str(layer)] = tensor
+    Args:
+        shard_files: List of paths (str or os.PathLike) to safetensors
+            shard files, in order
+        index_path: Path where the index JSON will be written
 
-    # Save merged tensors
-    save_file(tensors, output_file, metadata)
+    Raises:
+        Exception: If shard headers cannot be read
+    """
+    weight_map = {}
+    total_size = 0
+
+    for file_path in shard_files:
+        header, _data_start = _read_shard_header(file_path)
+        header.pop('__metadata__', None)
+        shard_name = os.path.basename(file_path)
+        for name, info in header.items():
+            begin, end = info['data_offsets']
+            weight_map[name] = shard_name
+            total_size += end - begin
+
+    index = {
+        'metadata': {'total_size': total_size},
+        'weight_map': weight_map,
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
 
 
 def get_split_files(folder_path: Path):
@@ -116,35 +585,38 @@ def get_split_files(folder_path: Path):
 
     Validates that all files agree on the total shard count (the "of-NNNN" part).
 
+    Uses a single os.scandir pass so each file's size comes from the
+    directory entry's cached stat - downstream validation and size
+    reporting reuse it instead of issuing their own stat() calls.
+
     Args:
         folder_path: Path object pointing to folder containing shard files
 
     Returns:
         tuple: (shard_files, total_expected) where:
-            - shard_files: List of Path objects sorted by shard number
+            - shard_files: List of (shard_num, Path, size) tuples sorted
+              by shard number
             - total_expected: Integer count of total shards expected
             - (None, None): If no valid shard files found or inconsistent counts
     """
-    # Pattern: model-00001-of-00004.safetensors
-    pattern = re.compile(r'model-(\d+)-of-(\d+)\.safetensors')
-
     shard_files = []
     total_expected = None
 
-    for file_path in folder_path.glob('*.safetensors'):
-        match = pattern.match(file_path.name)
-        if match:
-            shard_num = int(match.group(1))
-            total_shards = int(match.group(2))
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            match = _SHARD_RE.fullmatch(entry.name)
+            if match and entry.is_file():
+                shard_num = int(match.group(1))
+                total_shards = int(match.group(2))
 
-            if total_expected is None:
-                total_expected = total_shards
-            elif total_expected != total_shards:
-                print(f"❌ Error: Inconsistent shard counts found")
-                print(f"   Expected: {total_expected}, Found: {total_shards} in {file_path.name}")
-                return None, None
+                if total_expected is None:
+                    total_expected = total_shards
+                elif total_expected != total_shards:
+                    print(f"❌ Error: Inconsistent shard counts found")
+                    print(f"   Expected: {total_expected}, Found: {total_shards} in {entry.name}")
+                    return None, None
 
-            shard_files.append((shard_num, file_path))
+                shard_files.append((shard_num, Path(entry.path), entry.stat().st_size))
 
     if not shard_files:
         return None, None
@@ -152,7 +624,7 @@ def get_split_files(folder_path: Path):
     # Sort by shard number
     shard_files.sort(key=lambda x: x[0])
 
-    return [f[1] for f in shard_files], total_expected
+    return shard_files, total_expected
 
 
 def validate_shards(shard_files, total_expected):
@@ -165,7 +637,8 @@ def validate_shards(shard_files, total_expected):
     3. LFS check: Detects if files are Git LFS pointers (not downloaded)
 
     Args:
-        shard_files: List of Path objects for shard files (must be sorted)
+        shard_files: List of (shard_num, Path, size) tuples for shard files
+            (must be sorted)
         total_expected: Integer count of total shards that should exist
 
     Returns:
@@ -177,24 +650,22 @@ def validate_shards(shard_files, total_expected):
     if len(shard_files) != total_expected:
         return False, f"Missing shards: found {len(shard_files)}, expected {total_expected}"
 
-    # Check sequential numbering
-    for i, file_path in enumerate(shard_files, start=1):
-        # Extract shard number from filename
-        match = re.search(r'model-(\d+)-of-\d+\.safetensors', file_path.name)
-        if match:
-            shard_num = int(match.group(1))
-            if shard_num != i:
-                return False, f"Non-sequential shard numbering: expected {i:05d}, found {shard_num:05d}"
+    # Check sequential numbering using the numbers get_split_files already parsed
+    for i, (shard_num, file_path, file_size) in enumerate(shard_files, start=1):
+        if shard_num != i:
+            return False, f"Non-sequential shard numbering: expected {i:05d}, found {shard_num:05d}"
 
-    # Check for LFS pointers
-    for file_path in shard_files:
-        if is_lfs_pointer(file_path):
+    # Check for LFS pointers using the sizes from the directory scan
+    for shard_num, file_path, file_size in shard_files:
+        if is_lfs_pointer(file_path, file_size):
             return False, f"LFS pointer detected (not downloaded): {file_path.name}"
 
     return True, None
 
 
-def merge_model_shards(folder_path: str):
+def merge_model_shards(folder_path: str, index_only: bool = False,
+                       verify: bool = False, use_processes: bool = False,
+                       dry_run: bool = False):
     """
     Main orchestration function to merge split safetensors files.
 
@@ -206,8 +677,19 @@ def merge_model_shards(folder_path: str):
     5. Merges the files
     6. Verifies the output
 
+    In index-only mode, steps 4-6 are replaced by writing a
+    model.safetensors.index.json next to the shards (see write_shard_index),
+    which completes in milliseconds since no tensor bytes move.
+
     Args:
         folder_path: String path to folder containing model-*-of-*.safetensors files
+        index_only: If True, write a shard index instead of merging bytes
+        verify: If True, SHA-256 every tensor during the merge and check
+            the written output against the source digests
+        use_processes: If True, copy with one worker process per shard
+            (better on FUSE/NFS-backed storage)
+        dry_run: If True, run the full header/offset planning pass and
+            report the would-be output without writing any bytes
 
     Returns:
         bool: True if merge succeeded, False otherwise
@@ -251,16 +733,54 @@ def merge_model_shards(folder_path: str):
 
     print("✓ All shards validated (present and not LFS pointers)")
 
-    # Calculate total size
-    total_size = sum(f.stat().st_size for f in shard_files)
+    # Total size comes from the directory scan - no extra stat() calls
+    total_size = sum(size for _, _, size in shard_files)
     total_size_gb = total_size / (1024**3)
     print(f"✓ Total size: {total_size_gb:.2f} GB")
 
-    # Create merged subfolder
+    # Dry-run mode: plan the merge (headers only, no tensor bytes read, no
+    # output fd opened) and report what a real run would produce
+    if dry_run:
+        print(f"🔄 Dry run: planning merge (no bytes will be written)")
+        try:
+            header_bytes, copy_plan, merged_size = plan_merge(
+                [f for _, f, _ in shard_files])
+        except Exception as e:
+            print(f"❌ Merge planning failed: {e}")
+            return False
+        merged_size_gb = merged_size / (1024**3)
+        print(f"✅ Shards merge cleanly!")
+        print(f"   Tensors: {len(copy_plan)}")
+        print(f"   Header size: {len(header_bytes)} bytes")
+        print(f"   Output size would be: {merged_size_gb:.2f} GB ({merged_size} bytes)")
+        return True
+
+    # Index-only mode: write a shard index next to the shards, no byte copy
+    if index_only:
+        index_path = folder / "model.safetensors.index.json"
+        print(f"🔄 Writing shard index: {index_path.name}")
+        try:
+            write_shard_index([f for _, f, _ in shard_files], index_path)
+        except Exception as e:
+            print(f"❌ Index write failed: {e}")
+            return False
+        print(f"✅ Index complete!")
+        print(f"   Output: {index_path}")
+        print(f"   Tools that support the HuggingFace shard index format")
+        print(f"   can load the model directly - no bytes were copied.")
+        return True
+
+    # Create merged subfolder. A previous output can be hundreds of GB, so
+    # rename it aside (O(1)) and unlink it in the background while the new
+    # merge runs instead of stalling on a synchronous rmtree
     merged_folder = folder / "merged"
+    cleanup_thread = None
     if merged_folder.exists():
-        print(f"🗑️  Removing existing merged folder...")
-        shutil.rmtree(merged_folder)
+        old_folder = folder / f"merged.old.{os.getpid()}"
+        print(f"🗑️  Moving old merged folder aside, deleting in background...")
+        os.rename(merged_folder, old_folder)
+        cleanup_thread = threading.Thread(target=shutil.rmtree, args=(old_folder,))
+        cleanup_thread.start()
 
     merged_folder.mkdir()
     print(f"✓ Created merged folder: {merged_folder}")
@@ -275,13 +795,19 @@ def merge_model_shards(folder_path: str):
     # Merge the files
     try:
         merge_safetensor_files(
-            [str(f) for f in shard_files],
-            output_file=str(output_path)
+            [f for _, f, _ in shard_files],
+            output_file=output_path,
+            verify=verify,
+            use_processes=use_processes
         )
     except Exception as e:
         print(f"❌ Merge failed: {e}")
         return False
 
+    # Wait for the background delete so disk-space reporting is accurate
+    if cleanup_thread is not None:
+        cleanup_thread.join()
+
     # Verify output
     if not output_path.exists():
         print(f"❌ Error: Output file not created")
@@ -311,11 +837,42 @@ def main():
     Parses command-line arguments and invokes the merge process.
     Exits with status code 0 on success, 1 on failure.
     """
-    if len(sys.argv) != 2:
+    args = sys.argv[1:]
+
+    index_only = '--index-only' in args
+    if index_only:
+        args.remove('--index-only')
+
+    verify = '--verify' in args
+    if verify:
+        args.remove('--verify')
+
+    use_processes = '--procs' in args
+    if use_processes:
+        args.remove('--procs')
+
+    dry_run = '--dry-run' in args
+    if dry_run:
+        args.remove('--dry-run')
+
+    if len(args) != 1:
         print("Split Merge - Safetensors Shard Merger")
         print("")
-        print("Usage: splitmerge /path/to/model_folder")
-        print("   or: python splitmerge.py /path/to/model_folder")
+        print("Usage: splitmerge [options] /path/to/model_folder")
+        print("   or: python splitmerge.py [options] /path/to/model_folder")
+        print("")
+        print("Options:")
+        print("  --index-only   Write a model.safetensors.index.json next to")
+        print("                 the shards instead of merging bytes (instant;")
+        print("                 for tools that support the HF shard index)")
+        print("  --verify       SHA-256 every tensor during the merge and")
+        print("                 re-check the written output (catches silent")
+        print("                 corruption; slower than a plain merge)")
+        print("  --procs        Copy with one worker process per shard")
+        print("                 (recommended for FUSE/NFS-mounted models)")
+        print("  --dry-run      Plan the merge and report the would-be output")
+        print("                 size without writing anything (seconds, not")
+        print("                 hours; useful for CI merge-ability checks)")
         print("")
         print("Example:")
         print("  splitmerge ./qwen3vl")
@@ -329,8 +886,10 @@ def main():
         print("For more information: https://github.com/yourusername/splitmerge")
         sys.exit(1)
 
-    folder_path = sys.argv[1]
-    success = merge_model_shards(folder_path)
+    folder_path = args[0]
+    success = merge_model_shards(folder_path, index_only=index_only,
+                                 verify=verify, use_processes=use_processes,
+                                 dry_run=dry_run)
 
     sys.exit(0 if success else 1)
 